@@ -10,43 +10,24 @@ Author: ADK Demo
 Date: November 11, 2025
 """
 
-import os
-import requests
-import json
-from time import sleep
-from dotenv import load_dotenv
+import asyncio
+import logging
 from google.genai import types
 from google.adk.agents import LlmAgent
 from google.adk.models.google_llm import Gemini
 from google.adk.runners import InMemoryRunner
 
-from function_tool import search_jobs_api, calculate_job_statistics
+from env_setup import configure_logging, setup_environment
+from function_tool import MAX_PER_PAGE, search_jobs_api, calculate_job_statistics, pace
+
+
+logger = logging.getLogger(__name__)
 
 
 # ========================================
 # Setup and Configuration
 # ========================================
 
-def setup_environment() -> None:
-    """
-    Load environment variables and configure API key.
-
-    Loads GOOGLE_API_KEY from .env file and sets it as an environment variable.
-    """
-    try:
-        load_dotenv()
-        GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-        if GOOGLE_API_KEY and GOOGLE_API_KEY != "your_google_api_key_here":
-            os.environ["GOOGLE_API_KEY"] = GOOGLE_API_KEY
-            print("✅ Environment setup complete.")
-        else:
-            print(
-                "🔑 Authentication Error: Please add your GOOGLE_API_KEY to the .env file."
-            )
-    except Exception as e:
-        print(f"🔑 Authentication Error: Failed to load .env file. Details: {e}")
-
-
 # Configure retry options for robust API calls
 retry_config = types.HttpRetryOptions(
     attempts=5,
@@ -55,6 +36,10 @@ retry_config = types.HttpRetryOptions(
     http_status_codes=[429, 500, 503, 504],
 )
 
+# Shared model wrapper: instructions and tools live on each LlmAgent, so one
+# Gemini instance (and its underlying client) can serve every agent
+MODEL = Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config)
+
 
 # ========================================
 # FUNCTION TOOLS
@@ -77,21 +62,12 @@ def search_jobs(keywords: str, page: int = 1, per_page_count: int = 10) -> dict:
         Success: {"status": "success", "total_jobs": 150, "jobs": [...]}
         Error: {"status": "error", "error_message": "API request failed"}
     """
-    result = search_jobs_api(keywords, page, per_page_count)
-    
-    if result.get("success"):
-        return {
-            "status": "success",
-            "total_jobs": result.get("total_jobs", 0),
-            "page": result.get("current_page", page),
-            "results_on_page": result.get("results_on_page", 0),
-            "jobs": result.get("jobs", [])
-        }
-    else:
-        return {
-            "status": "error",
-            "error_message": result.get("error", "Unknown error")
-        }
+    per_page_count = max(1, min(per_page_count, MAX_PER_PAGE))
+
+    # The agent reads descriptions when summarizing jobs, so ask for them here
+    return search_jobs_api(
+        keywords, page, per_page_count, include_description=True
+    ).to_tool_response()
 
 
 def get_job_statistics(keywords: str) -> dict:
@@ -109,26 +85,7 @@ def get_job_statistics(keywords: str) -> dict:
         Success: {"status": "success", "stats": {...}}
         Error: {"status": "error", "error_message": "..."}
     """
-    result = calculate_job_statistics(keywords, sample_size=20)
-    
-    if result.get("success"):
-        stats = result.get("statistics", {})
-        return {
-            "status": "success",
-            "keyword": result.get("keyword", keywords),
-            "stats": {
-                "total_jobs_found": result.get("total_jobs_in_market", 0),
-                "jobs_analyzed": result.get("jobs_analyzed", 0),
-                "top_categories": stats.get("top_categories", {}),
-                "employment_types": stats.get("employment_types", {}),
-                "top_locations": stats.get("top_locations", {}),
-            }
-        }
-    else:
-        return {
-            "status": "error",
-            "error_message": result.get("error", "Unknown error")
-        }
+    return calculate_job_statistics(keywords, sample_size=20).to_tool_response()
 
 
 # ========================================
@@ -142,32 +99,40 @@ async def demo_function_tools() -> None:
     This shows how custom Python functions become agent tools that the LLM
     can call to retrieve real-world data from external APIs.
     """
-    print("\n" + "=" * 60)
-    print("DEMO: FUNCTION TOOLS")
-    print("=" * 60)
-    print("Testing custom function tools: job search API integration\n")
+    logger.info("\n" + "=" * 60)
+    logger.info("DEMO: FUNCTION TOOLS")
+    logger.info("=" * 60)
+    logger.info("Testing custom function tools: job search API integration\n")
 
     # Test individual functions
-    print("Testing functions directly:")
-    print(f"Searching for 'software engineer' jobs...")
-    result = search_jobs("software engineer", per_page_count=3)
+    # Both calls block on network I/O, so run them in worker threads concurrently
+    logger.info("Testing functions directly:")
+    search_task = asyncio.create_task(
+        asyncio.to_thread(search_jobs, "software engineer", per_page_count=3)
+    )
+    stats_task = asyncio.create_task(
+        asyncio.to_thread(get_job_statistics, "data analyst")
+    )
+
+    logger.info("Searching for 'software engineer' jobs...")
+    result = await search_task
     if result["status"] == "success":
-        print(f"✓ Found {result['total_jobs']} total jobs")
-        print(f"✓ Retrieved {result['results_on_page']} results on page {result['page']}\n")
+        logger.info("✓ Found %s total jobs", result['total_jobs'])
+        logger.info("✓ Retrieved %s results on page %s\n", result['results_on_page'], result['page'])
 
-    print(f"Getting statistics for 'data analyst' jobs...")
-    stats = get_job_statistics("data analyst")
+    logger.info("Getting statistics for 'data analyst' jobs...")
+    stats = await stats_task
     if stats["status"] == "success":
-        print(f"✓ Statistics computed successfully")
-        print(f"✓ Total jobs: {stats['stats']['total_jobs_found']}\n")
+        logger.info("✓ Statistics computed successfully")
+        logger.info("✓ Total jobs: %s\n", stats['stats']['total_jobs_found'])
 
     # Respect rate limit
-    sleep(1)
+    await pace(1)
 
     # Create agent with function tools only
     simple_agent = LlmAgent(
         name="SimpleJobSearchAgent",
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
+        model=MODEL,
         # instruction="""You are a job search assistant. Use search_jobs() to find job
         # listings and get_job_statistics() for market insights. Always check for errors.""",
         # tools=[search_jobs, get_job_statistics],
@@ -178,14 +143,14 @@ async def demo_function_tools() -> None:
 
     runner = InMemoryRunner(agent=simple_agent)
 
-    print("Agent Query: Find cook jobs, summarize the key details and show in point form.")
+    logger.info("Agent Query: Find cook jobs, summarize the key details and show in point form.")
     response = await runner.run_debug(
         "Find cook jobs, summarize the key details and show in point form."
     )
-    print(f"\n✅ Function tools demonstration complete!\n")
+    logger.info("\n✅ Function tools demonstration complete!\n")
 
     # Respect rate limit
-    sleep(2)
+    await pace(2)
 
 
 # ========================================
@@ -196,13 +161,16 @@ async def main() -> None:
     """
     Main function to run the function tools demonstration.
     """
-    print("\n" + "=" * 60)
-    print("ADK FUNCTION TOOLS DEMONSTRATION")
-    print("=" * 60)
-    print("This script demonstrates:")
-    print("1. Function Tools - Job search API")
-    print("2. Function Tools - Job search API + statistics")
-    print("=" * 60)
+    configure_logging()
+    logger.setLevel(logging.INFO)
+
+    logger.info("\n" + "=" * 60)
+    logger.info("ADK FUNCTION TOOLS DEMONSTRATION")
+    logger.info("=" * 60)
+    logger.info("This script demonstrates:")
+    logger.info("1. Function Tools - Job search API")
+    logger.info("2. Function Tools - Job search API + statistics")
+    logger.info("=" * 60)
 
     # Setup environment
     setup_environment()
@@ -212,5 +180,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
\ No newline at end of file
@@ -10,45 +10,27 @@ Author: ADK Demo
 Date: November 11, 2025
 """
 
-import os
-import requests
-import json
-from time import sleep
-from dotenv import load_dotenv
+import asyncio
+import functools
+import logging
 from google.genai import types
 from google.adk.agents import LlmAgent
 from google.adk.models.google_llm import Gemini
 from google.adk.runners import InMemoryRunner
 
-from function_tool import search_jobs_api
+from env_setup import configure_logging, setup_environment
+from function_tool import MAX_PER_PAGE, search_jobs_api, pace
 from google.adk.tools import AgentTool
 from google.adk.code_executors import BuiltInCodeExecutor
 
 
+logger = logging.getLogger(__name__)
+
+
 # ========================================
 # Setup and Configuration
 # ========================================
 
-def setup_environment() -> None:
-    """
-    Load environment variables and configure API key.
-
-    Loads GOOGLE_API_KEY from .env file and sets it as an environment variable.
-    """
-    try:
-        load_dotenv()
-        GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-        if GOOGLE_API_KEY and GOOGLE_API_KEY != "your_google_api_key_here":
-            os.environ["GOOGLE_API_KEY"] = GOOGLE_API_KEY
-            print("✅ Environment setup complete.")
-        else:
-            print(
-                "🔑 Authentication Error: Please add your GOOGLE_API_KEY to the .env file."
-            )
-    except Exception as e:
-        print(f"🔑 Authentication Error: Failed to load .env file. Details: {e}")
-
-
 # Configure retry options for robust API calls
 retry_config = types.HttpRetryOptions(
     attempts=5,
@@ -57,6 +39,10 @@ retry_config = types.HttpRetryOptions(
     http_status_codes=[429, 500, 503, 504],
 )
 
+# Shared model wrapper: instructions and tools live on each LlmAgent, so one
+# Gemini instance (and its underlying client) can serve every agent
+MODEL = Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config)
+
 
 # ========================================
 # FUNCTION TOOLS (Required for Agent Tools Demo)
@@ -79,40 +65,33 @@ def search_jobs(keywords: str, page: int = 1, per_page_count: int = 10) -> dict:
         Success: {"status": "success", "total_jobs": 150, "jobs": [...]}
         Error: {"status": "error", "error_message": "API request failed"}
     """
-    result = search_jobs_api(keywords, page, per_page_count)
-    
-    if result.get("success"):
-        return {
-            "status": "success",
-            "total_jobs": result.get("total_jobs", 0),
-            "page": result.get("current_page", page),
-            "results_on_page": result.get("results_on_page", 0),
-            "jobs": result.get("jobs", [])
-        }
-    else:
-        return {
-            "status": "error",
-            "error_message": result.get("error", "Unknown error")
-        }
+    per_page_count = max(1, min(per_page_count, MAX_PER_PAGE))
+
+    # The agent reads descriptions when summarizing jobs, so ask for them here
+    return search_jobs_api(
+        keywords, page, per_page_count, include_description=True
+    ).to_tool_response()
 
 
 # ========================================
 # AGENT TOOLS
 # ========================================
 
+@functools.lru_cache(maxsize=1)
 def create_data_analyst_agent() -> LlmAgent:
     """
     Create a specialized data analyst agent that analyzes job market data.
 
     This agent is designed to be used as a tool by other agents, demonstrating
     the Agent Tool pattern where one agent delegates data analysis tasks to another.
+    The agent holds no per-invocation state, so one instance is cached and shared.
 
     Returns:
         LlmAgent configured with code execution capabilities for data analysis.
     """
     analyst_agent = LlmAgent(
         name="DataAnalystAgent",
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
+        model=MODEL,
         instruction="""You are a specialized data analyst that analyzes job market data.
 
         Your task:
@@ -148,7 +127,7 @@ def create_job_search_assistant() -> LlmAgent:
 
     job_assistant = LlmAgent(
         name="JobSearchAssistant",
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
+        model=MODEL,
         instruction="""You are a helpful job search assistant for Singapore jobs.
 
         For job search queries:
@@ -158,6 +137,9 @@ def create_job_search_assistant() -> LlmAgent:
         4. Provide clear, structured responses with actionable information
         5. When showing job results, highlight key details: title, company, location, salary
 
+        When multiple independent tool calls are needed (e.g. several searches),
+        request them in a single turn so they can run in parallel.
+
         If any tool returns status "error", explain the issue to the user clearly.
         Always provide helpful guidance for job seekers.
         """,
@@ -180,23 +162,23 @@ async def demo_agent_tools() -> None:
     This shows the delegation pattern where a job search assistant delegates
     data analysis to a specialized analyst agent.
     """
-    print("\n" + "=" * 60)
-    print("DEMO: AGENT TOOLS")
-    print("=" * 60)
-    print("Testing agent delegation: Job assistant uses data analyst agent\n")
+    logger.info("\n" + "=" * 60)
+    logger.info("DEMO: AGENT TOOLS")
+    logger.info("=" * 60)
+    logger.info("Testing agent delegation: Job assistant uses data analyst agent\n")
 
     job_assistant = create_job_search_assistant()
     runner = InMemoryRunner(agent=job_assistant)
 
-    print("Agent Query: Search for 'engineering' jobs and analyze the market trends.")
-    print("What are the top categories and employment types?")
+    logger.info("Agent Query: Search for 'engineering' jobs and analyze the market trends.")
+    logger.info("What are the top categories and employment types?")
     response = await runner.run_debug(
         "Search for 'engineering' jobs and analyze the market trends. What are the top categories and what insights can you provide?"
     )
-    print(f"\n✅ Agent tools demonstration complete!\n")
+    logger.info("\n✅ Agent tools demonstration complete!\n")
 
     # Respect rate limit
-    sleep(2)
+    await pace(2)
 
 
 # ========================================
@@ -207,13 +189,16 @@ async def main() -> None:
     """
     Main function to run the agent tools demonstration.
     """
-    print("\n" + "=" * 60)
-    print("ADK AGENT TOOLS DEMONSTRATION")
-    print("Using FindSGJobs API as Real-World Example")
-    print("=" * 60)
-    print("This script demonstrates:")
-    print("1. Agent Tools - Data analyst agent delegation")
-    print("=" * 60)
+    configure_logging()
+    logger.setLevel(logging.INFO)
+
+    logger.info("\n" + "=" * 60)
+    logger.info("ADK AGENT TOOLS DEMONSTRATION")
+    logger.info("Using FindSGJobs API as Real-World Example")
+    logger.info("=" * 60)
+    logger.info("This script demonstrates:")
+    logger.info("1. Agent Tools - Data analyst agent delegation")
+    logger.info("=" * 60)
 
     # Setup environment
     setup_environment()
@@ -223,5 +208,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
\ No newline at end of file
@@ -22,8 +22,10 @@ Usage:
 """
 
 import os
+import sys
 import asyncio
-from dotenv import load_dotenv
+import functools
+import logging
 from google.genai import types
 from google.adk.agents import LlmAgent
 from google.adk.models.google_llm import Gemini
@@ -34,27 +36,16 @@ from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
 from google.adk.code_executors import BuiltInCodeExecutor
 from mcp import StdioServerParameters
 
+from env_setup import configure_logging, setup_environment
+
+
+logger = logging.getLogger(__name__)
+
 
 # ========================================
 # Setup and Configuration
 # ========================================
 
-def setup_environment() -> None:
-    """Load environment variables and configure API key."""
-    try:
-        load_dotenv()
-        GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-        if GOOGLE_API_KEY and GOOGLE_API_KEY != "your_google_api_key_here":
-            os.environ["GOOGLE_API_KEY"] = GOOGLE_API_KEY
-            print("✅ Environment setup complete.")
-        else:
-            print(
-                "🔑 Authentication Error: Please add your GOOGLE_API_KEY to the .env file."
-            )
-    except Exception as e:
-        print(f"🔑 Authentication Error: Failed to load .env file. Details: {e}")
-
-
 # Configure retry options for robust API calls
 retry_config = types.HttpRetryOptions(
     attempts=5,
@@ -63,6 +54,10 @@ retry_config = types.HttpRetryOptions(
     http_status_codes=[429, 500, 503, 504],
 )
 
+# Shared model wrapper: instructions and tools live on each LlmAgent, so one
+# Gemini instance (and its underlying client) can serve every agent
+MODEL = Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config)
+
 
 # ========================================
 # Create MCP Toolset for FindSGJobs
@@ -92,33 +87,69 @@ def create_findsgjobs_mcp_toolset() -> McpToolset:
         )
     )
     
-    print("✅ FindSGJobs MCP toolset created")
-    print(f"   Server: {server_path}")
-    print("   Available tools:")
-    print("   • search_jobs - Search for job listings")
-    print("   • get_job_statistics - Get market statistics")
-    print("   • get_job_details - Get detailed job info")
+    logger.info("✅ FindSGJobs MCP toolset created")
+    logger.info("   Server: %s", server_path)
+    logger.info("   Available tools:")
+    logger.info("   • search_jobs - Search for job listings")
+    logger.info("   • get_job_statistics - Get market statistics")
+    logger.info("   • get_job_details - Get detailed job info")
     
     return mcp_toolset
 
 
+# ========================================
+# Create Search Agent
+# ========================================
+
+def create_search_agent(mcp_toolset: McpToolset) -> LlmAgent:
+    """
+    Create a lightweight agent that answers job search and market statistics queries.
+    
+    Both basic demos share this agent (and one runner), choosing between
+    search_jobs and get_job_statistics based on the query.
+    
+    Args:
+        mcp_toolset: The FindSGJobs MCP toolset
+        
+    Returns:
+        LlmAgent configured with the MCP tools only
+    """
+    agent = LlmAgent(
+        name="SimpleSearchAgent",
+        model=MODEL,
+        instruction="""You are a job search assistant for Singapore.
+        
+        - To find jobs: Use search_jobs. Present the results clearly with job titles,
+          companies, and key details.
+        - For job market questions: Use get_job_statistics to get market data.
+          Present the statistics clearly with insights.
+        - When multiple tool calls are needed, request them in a single turn
+          so they can run in parallel.
+        """,
+        tools=[mcp_toolset],
+    )
+    return agent
+
+
 # ========================================
 # Create Data Analyst Agent
 # ========================================
 
+@functools.lru_cache(maxsize=1)
 def create_analyst_agent() -> LlmAgent:
     """
     Create a data analyst agent that can analyze job market data.
     
     This agent uses code execution to perform complex analysis on the
-    data retrieved from the MCP server.
+    data retrieved from the MCP server. The agent holds no per-invocation
+    state, so one instance is cached and shared.
     
     Returns:
         LlmAgent configured for data analysis
     """
     analyst = LlmAgent(
         name="JobMarketAnalyst",
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
+        model=MODEL,
         instruction="""You are a specialized job market analyst.
         
         Your expertise:
@@ -162,7 +193,7 @@ def create_job_search_assistant(mcp_toolset: McpToolset, analyst: LlmAgent) -> L
     """
     assistant = LlmAgent(
         name="JobSearchAssistant",
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
+        model=MODEL,
         instruction="""You are an expert job search assistant for Singapore.
         
         Your capabilities:
@@ -174,6 +205,11 @@ def create_job_search_assistant(mcp_toolset: McpToolset, analyst: LlmAgent) -> L
         - For job searches: Use search_jobs with relevant keywords
         - For market insights: Use get_job_statistics 
         - For analysis: Delegate to JobMarketAnalyst with the data
+        - When multiple tool calls are needed, request them in a single turn
+          so they can run in parallel
+        - For combined search-and-analyze queries, ALWAYS call search_jobs and
+          get_job_statistics in the same turn (parallel tool calls), then call
+          JobMarketAnalyst exactly once with both payloads
         - Always provide clear, actionable advice for job seekers
         - Highlight key details: title, company, salary, location
         
@@ -191,8 +227,8 @@ def create_job_search_assistant(mcp_toolset: McpToolset, analyst: LlmAgent) -> L
         ],
     )
     
-    print("✅ Job Search Assistant created")
-    print("   Capabilities: MCP tools + Data analyst agent")
+    logger.info("✅ Job Search Assistant created")
+    logger.info("   Capabilities: MCP tools + Data analyst agent")
     
     return assistant
 
@@ -201,125 +237,77 @@ def create_job_search_assistant(mcp_toolset: McpToolset, analyst: LlmAgent) -> L
 # Demonstration Functions
 # ========================================
 
-async def demo_basic_job_search():
+async def demo_basic_job_search(runner: InMemoryRunner):
     """
     Demo 1: Basic job search using MCP server.
     
     Shows how the agent uses the MCP server to search for jobs.
-    """
-    print("\n" + "=" * 70)
-    print("DEMO 1: Basic Job Search with MCP Server")
-    print("=" * 70)
-    print("Testing MCP tool: search_jobs\n")
     
-    # Create MCP toolset for this demo
-    mcp_toolset = create_findsgjobs_mcp_toolset()
+    Args:
+        runner: The shared runner for the search agent
+    """
+    logger.info("\n" + "=" * 70)
+    logger.info("DEMO 1: Basic Job Search with MCP Server")
+    logger.info("=" * 70)
+    logger.info("Testing MCP tool: search_jobs\n")
     
-    try:
-        # Create simple agent with just MCP tools
-        agent = LlmAgent(
-            name="SimpleSearchAgent",
-            model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
-            instruction="""You are a job search assistant. Use search_jobs to find jobs.
-        Present the results clearly with job titles, companies, and key details.""",
-            tools=[mcp_toolset],
-        )
-        
-        runner = InMemoryRunner(agent=agent)
-        
-        print("Query: Find me 5 cook jobs in Singapore\n")
-        response = await runner.run_debug(
-            "Find me 5 cook jobs in Singapore"
-        )
-        
-        print("\n✅ Basic job search demo complete!\n")
+    logger.info("Query: Find me 5 cook jobs in Singapore\n")
+    response = await runner.run_debug(
+        "Find me 5 cook jobs in Singapore",
+        session_id="basic_job_search",
+    )
     
-    finally:
-        # Properly close the MCP toolset
-        try:
-            if hasattr(mcp_toolset, 'close'):
-                await mcp_toolset.close()
-        except Exception as e:
-            print(f"Warning: Error closing MCP toolset: {e}")
+    logger.info("\n✅ Basic job search demo complete!\n")
 
 
-async def demo_job_market_statistics():
+async def demo_job_market_statistics(runner: InMemoryRunner):
     """
     Demo 2: Get job market statistics using MCP server.
     
     Shows how the agent uses the MCP server to get market insights.
-    """
-    print("\n" + "=" * 70)
-    print("DEMO 2: Job Market Statistics with MCP Server")
-    print("=" * 70)
-    print("Testing MCP tool: get_job_statistics\n")
-    
-    # Create MCP toolset for this demo
-    mcp_toolset = create_findsgjobs_mcp_toolset()
     
-    try:
-        # Create agent with MCP tools
-        agent = LlmAgent(
-            name="StatsAgent",
-            model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
-            instruction="""You are a job market analyst. Use get_job_statistics to get 
-        market data. Present the statistics clearly with insights.""",
-            tools=[mcp_toolset],
-        )
-        
-        runner = InMemoryRunner(agent=agent)
-
-        print("Query: What's the job market like for cooks?\n")
-        response = await runner.run_debug(
-            "What's the job market like for cooks? Give me statistics."
-        )
-        
-        print("\n✅ Job market statistics demo complete!\n")
+    Args:
+        runner: The shared runner for the search agent
+    """
+    logger.info("\n" + "=" * 70)
+    logger.info("DEMO 2: Job Market Statistics with MCP Server")
+    logger.info("=" * 70)
+    logger.info("Testing MCP tool: get_job_statistics\n")
+
+    logger.info("Query: What's the job market like for cooks?\n")
+    response = await runner.run_debug(
+        "What's the job market like for cooks? Give me statistics.",
+        session_id="job_market_statistics",
+    )
     
-    finally:
-        # Properly close the MCP toolset
-        try:
-            if hasattr(mcp_toolset, 'close'):
-                await mcp_toolset.close()
-        except Exception as e:
-            print(f"Warning: Error closing MCP toolset: {e}")
+    logger.info("\n✅ Job market statistics demo complete!\n")
 
 
-async def demo_full_assistant():
+async def demo_full_assistant(mcp_toolset: McpToolset, analyst: LlmAgent):
     """
     Demo 3: Complete job search assistant with analysis.
     
     Shows the full power of combining MCP tools with agent tools.
+    
+    Args:
+        mcp_toolset: The shared FindSGJobs MCP toolset
+        analyst: The data analyst agent
     """
-    print("\n" + "=" * 70)
-    print("DEMO 3: Complete Job Search Assistant (MCP + Agent Tools)")
-    print("=" * 70)
-    print("Combining: FindSGJobs MCP Server + Data Analyst Agent\n")
+    logger.info("\n" + "=" * 70)
+    logger.info("DEMO 3: Complete Job Search Assistant (MCP + Agent Tools)")
+    logger.info("=" * 70)
+    logger.info("Combining: FindSGJobs MCP Server + Data Analyst Agent\n")
     
-    # Create MCP toolset for this demo
-    mcp_toolset = create_findsgjobs_mcp_toolset()
+    assistant = create_job_search_assistant(mcp_toolset, analyst)
     
-    try:
-        # Create all components
-        analyst = create_analyst_agent()
-        assistant = create_job_search_assistant(mcp_toolset, analyst)
-        
-        runner = InMemoryRunner(agent=assistant)
-        
-        print("Query: Find cook jobs and analyze the market opportunities\n")
-        response = await runner.run_debug(
-            "Find cook jobs in Singapore, get market statistics, and analyze what this means for someone looking for cook positions. What are the key insights and recommendations?"
-        )
-        
-        print("\n✅ Complete assistant demo complete!\n")
+    runner = InMemoryRunner(agent=assistant)
     
-    finally:
-        # Properly close the MCP toolset
-        try:
-            if hasattr(mcp_toolset, 'close'):
-                await mcp_toolset.close()
-        except Exception as e:
-            print(f"Warning: Error closing MCP toolset: {e}")
+    logger.info("Query: Find cook jobs and analyze the market opportunities\n")
+    response = await runner.run_debug(
+        "Find cook jobs in Singapore, get market statistics, and analyze what this means for someone looking for cook positions. What are the key insights and recommendations?"
+    )
+    
+    logger.info("\n✅ Complete assistant demo complete!\n")
 
 
 # ========================================
@@ -332,14 +320,20 @@ async def main():
     
     Executes all demos to showcase MCP server integration with ADK.
     """
-    print("\n" + "=" * 70)
-    print("FINDSGJOBS MCP SERVER WITH GOOGLE ADK DEMONSTRATION")
-    print("=" * 70)
-    print("This script demonstrates:")
-    print("1. Basic MCP server integration")
-    print("2. Job market statistics via MCP")
-    print("3. Combining MCP tools with Agent tools")
-    print("=" * 70)
+    configure_logging()
+    logger.setLevel(logging.INFO)
+    
+    # Line-buffer stdout so output from concurrently running demos stays legible
+    sys.stdout.reconfigure(line_buffering=True)
+    
+    logger.info("\n" + "=" * 70)
+    logger.info("FINDSGJOBS MCP SERVER WITH GOOGLE ADK DEMONSTRATION")
+    logger.info("=" * 70)
+    logger.info("This script demonstrates:")
+    logger.info("1. Basic MCP server integration")
+    logger.info("2. Job market statistics via MCP")
+    logger.info("3. Combining MCP tools with Agent tools")
+    logger.info("=" * 70)
     
     # Setup environment
     setup_environment()
@@ -349,27 +343,48 @@ async def main():
     server_path = os.path.join(current_dir, "findsgjobs_mcp_server.py")
     
     if not os.path.exists(server_path):
-        print(f"\n❌ Error: MCP server not found at {server_path}")
-        print("Please ensure findsgjobs_mcp_server.py is in the same directory.")
+        logger.error("\n❌ Error: MCP server not found at %s", server_path)
+        logger.error("Please ensure findsgjobs_mcp_server.py is in the same directory.")
         return
     
-    print(f"\n✅ MCP server found: {server_path}")
+    logger.info("\n✅ MCP server found: %s", server_path)
+    
+    # Create the MCP toolset once so all demos share a single server process
+    mcp_toolset = create_findsgjobs_mcp_toolset()
+    analyst = create_analyst_agent()
+    
+    # One runner serves both basic demos; separate sessions keep their histories apart
+    search_runner = InMemoryRunner(agent=create_search_agent(mcp_toolset))
     
     # Run demonstrations
     try:
-        await demo_basic_job_search()
-        await demo_job_market_statistics()
-        await demo_full_assistant()
+        # Demos 1 and 2 are independent, so their LLM and MCP calls can overlap.
+        # The task group cancels the other demo if one fails, so the shared
+        # toolset is never closed while a demo is still using it.
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(demo_basic_job_search(search_runner))
+            tg.create_task(demo_job_market_statistics(search_runner))
+        await demo_full_assistant(mcp_toolset, analyst)
         
     except Exception as e:
-        print(f"\n❌ Error during demonstration: {str(e)}")
+        errors = e.exceptions if isinstance(e, ExceptionGroup) else (e,)
+        for error in errors:
+            logger.error("\n❌ Error during demonstration: %s", error)
+    
+    finally:
+        # Properly close the MCP toolset
+        try:
+            if hasattr(mcp_toolset, 'close'):
+                await mcp_toolset.close()
+        except Exception as e:
+            logger.warning("Warning: Error closing MCP toolset: %s", e)
 
 
 if __name__ == "__main__":
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
-        print("\n🛑 Interrupted by user")
+        logger.info("\n🛑 Interrupted by user")
     except Exception as e:
-        print(f"\n❌ Fatal error: {e}")
+        logger.error("\n❌ Fatal error: %s", e)
         raise
@@ -0,0 +1,62 @@
+"""
+Environment Setup
+=================
+This module loads environment variables shared by all demo scripts.
+
+Functions:
+- configure_logging: Send demo log output to stdout without library INFO noise
+- setup_environment: Load .env once per process and configure the API key
+
+Author: ADK Demo
+Date: November 11, 2025
+"""
+
+import os
+import sys
+import logging
+from dotenv import load_dotenv
+
+
+logger = logging.getLogger(__name__)
+
+
+# Set once the .env file has been loaded, so repeat calls are no-ops
+_INITIALIZED = False
+
+
+def configure_logging() -> None:
+    """
+    Print bare log messages to stdout, keeping the root logger at WARNING.
+
+    Third-party libraries (httpx, ADK) therefore stay quiet; each demo raises
+    its own module logger to INFO, and this module's logger is raised here.
+    """
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    logger.setLevel(logging.INFO)
+
+
+def setup_environment() -> None:
+    """
+    Load environment variables and configure API key.
+
+    Loads GOOGLE_API_KEY from .env file and sets it as an environment variable.
+    Only the first call does any work; later calls return immediately.
+    """
+    global _INITIALIZED
+    if _INITIALIZED:
+        return
+
+    try:
+        load_dotenv(override=False)
+        GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+        if GOOGLE_API_KEY and GOOGLE_API_KEY != "your_google_api_key_here":
+            os.environ["GOOGLE_API_KEY"] = GOOGLE_API_KEY
+            logger.info("✅ Environment setup complete.")
+        else:
+            logger.error(
+                "🔑 Authentication Error: Please add your GOOGLE_API_KEY to the .env file."
+            )
+    except Exception as e:
+        logger.error("🔑 Authentication Error: Failed to load .env file. Details: %s", e)
+
+    _INITIALIZED = True
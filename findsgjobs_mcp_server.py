@@ -17,15 +17,14 @@ Based on: 1_basic_api_usage.py
 """
 
 import asyncio
-import requests
+import sys
 from typing import Any
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
-from bs4 import BeautifulSoup
-import re
 
-from function_tool import search_jobs_api, calculate_job_statistics
+# function_tool (and with it requests) is imported inside the tool
+# handlers so the server answers the client's initialize request sooner.
 
 
 # Initialize MCP Server
@@ -36,6 +35,73 @@ app = Server("findsgjobs-server")
 # MCP Server Tool Definitions
 # ============================================================
 
+# Tool list is static, so build it once at import instead of per request
+_TOOLS: list[Tool] = [
+    Tool(
+        name="search_jobs",
+        description="""Search for jobs in Singapore using keywords. 
+        Returns a list of job listings with details like title, company, location, 
+        salary, requirements, and more. Rate limit: 60 requests per minute.""",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "keywords": {
+                    "type": "string",
+                    "description": "Search keywords (e.g., 'software engineer', 'cook', 'manager')"
+                },
+                "page": {
+                    "type": "integer",
+                    "description": "Page number for pagination (default: 1)",
+                    "default": 1
+                },
+                "per_page_count": {
+                    "type": "integer",
+                    "description": "Number of results per page (max: 20, default: 10)",
+                    "default": 10
+                }
+            },
+            "required": ["keywords"]
+        }
+    ),
+    Tool(
+        name="get_job_statistics",
+        description="""Get aggregated statistics about the job market for specific keywords.
+        Returns statistics like top categories, employment types, locations, and requirements.
+        Based on analysis of up to 20 job listings.""",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "keywords": {
+                    "type": "string",
+                    "description": "Search keywords to analyze (e.g., 'data scientist', 'accountant')"
+                },
+                "sample_size": {
+                    "type": "integer",
+                    "description": "Number of jobs to analyze (max: 20, default: 20)",
+                    "default": 20
+                }
+            },
+            "required": ["keywords"]
+        }
+    ),
+    Tool(
+        name="get_job_details",
+        description="""Get detailed information about a specific job by ID.
+        Use this after searching for jobs to get the full description and requirements.""",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "The job ID from search results"
+                }
+            },
+            "required": ["job_id"]
+        }
+    )
+]
+
+
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """
@@ -44,194 +110,180 @@ async def list_tools() -> list[Tool]:
     Returns:
         List of Tool objects describing available capabilities
     """
-    return [
-        Tool(
-            name="search_jobs",
-            description="""Search for jobs in Singapore using keywords. 
-            Returns a list of job listings with details like title, company, location, 
-            salary, requirements, and more. Rate limit: 60 requests per minute.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "keywords": {
-                        "type": "string",
-                        "description": "Search keywords (e.g., 'software engineer', 'cook', 'manager')"
-                    },
-                    "page": {
-                        "type": "integer",
-                        "description": "Page number for pagination (default: 1)",
-                        "default": 1
-                    },
-                    "per_page_count": {
-                        "type": "integer",
-                        "description": "Number of results per page (max: 20, default: 10)",
-                        "default": 10
-                    }
-                },
-                "required": ["keywords"]
-            }
-        ),
-        Tool(
-            name="get_job_statistics",
-            description="""Get aggregated statistics about the job market for specific keywords.
-            Returns statistics like top categories, employment types, locations, and requirements.
-            Based on analysis of up to 20 job listings.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "keywords": {
-                        "type": "string",
-                        "description": "Search keywords to analyze (e.g., 'data scientist', 'accountant')"
-                    },
-                    "sample_size": {
-                        "type": "integer",
-                        "description": "Number of jobs to analyze (max: 20, default: 20)",
-                        "default": 20
-                    }
-                },
-                "required": ["keywords"]
-            }
-        ),
-        Tool(
-            name="get_job_details",
-            description="""Get detailed information about a specific job by ID.
-            Use this after searching for jobs to get the full description and requirements.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "job_id": {
-                        "type": "string",
-                        "description": "The job ID from search results"
-                    }
-                },
-                "required": ["job_id"]
-            }
-        )
-    ]
+    # Fresh outer list in case the framework mutates it; Tool objects are shared
+    return list(_TOOLS)
 
 
-@app.call_tool()
-async def call_tool(name: str, arguments: Any) -> list[TextContent]:
+# ============================================================
+# MCP Tool Handlers
+# ============================================================
+
+async def _handle_search_jobs(arguments: Any) -> list[TextContent]:
     """
-    Handle tool execution requests from MCP clients.
+    Run the search_jobs tool and format the listings as text.
+    """
+    from function_tool import MAX_PER_PAGE, search_jobs_api_async
     
-    Args:
-        name: Tool name to execute
-        arguments: Tool-specific arguments
+    keywords = arguments.get("keywords", "")
+    
+    # Validate numeric arguments once here so the API layer sees canonical values
+    try:
+        page = max(1, int(arguments.get("page", 1)))
+        per_page_count = max(1, min(int(arguments.get("per_page_count", 10)), MAX_PER_PAGE))
+    except (TypeError, ValueError):
+        return [TextContent(
+            type="text",
+            text="Error: 'page' and 'per_page_count' must be integers"
+        )]
+    
+    if not keywords:
+        return [TextContent(
+            type="text",
+            text="Error: 'keywords' parameter is required"
+        )]
+    
+    result = await search_jobs_api_async(keywords, page, per_page_count, format_text=True)
+    
+    if result.success:
+        # Format response nicely, collecting lines and joining once at the end
+        parts = [
+            f"Found {result.total_jobs} jobs for '{keywords}'",
+            f"Showing page {result.current_page} of {result.total_pages}",
+            f"Results on this page: {result.results_on_page}",
+            "",
+        ]
+        parts.extend(result.job_lines)
         
-    Returns:
-        List of TextContent with execution results
+        return [TextContent(type="text", text="\n".join(parts))]
+    else:
+        return [TextContent(
+            type="text",
+            text=f"Error: {result.error or 'Unknown error'}"
+        )]
+
+
+async def _handle_job_statistics(arguments: Any) -> list[TextContent]:
     """
-    if name == "search_jobs":
-        keywords = arguments.get("keywords", "")
-        page = arguments.get("page", 1)
-        per_page_count = arguments.get("per_page_count", 10)
-        
-        if not keywords:
-            return [TextContent(
-                type="text",
-                text="Error: 'keywords' parameter is required"
-            )]
-        
-        result = search_jobs_api(keywords, page, per_page_count)
-        
-        if result.get("success"):
-            # Format response nicely
-            response_text = f"Found {result['total_jobs']} jobs for '{keywords}'\n"
-            response_text += f"Showing page {result['current_page']} of {result['total_pages']}\n"
-            response_text += f"Results on this page: {result['results_on_page']}\n\n"
-            
-            for i, job in enumerate(result['jobs'], 1):
-                response_text += f"{i}. {job['title']}\n"
-                response_text += f"   Company: {job['company']}\n"
-                response_text += f"   Job ID: {job['job_id']}\n"
-                if job['salary']:
-                    response_text += f"   Salary: {job['salary']}\n"
-                if job['location']:
-                    response_text += f"   Location: {', '.join(job['location'][:3])}\n"
-                if job['categories']:
-                    response_text += f"   Categories: {', '.join(job['categories'])}\n"
-                response_text += f"   URL: {job['url']}\n\n"
-            
-            return [TextContent(type="text", text=response_text)]
-        else:
-            return [TextContent(
-                type="text",
-                text=f"Error: {result.get('error', 'Unknown error')}"
-            )]
+    Run the get_job_statistics tool and format the statistics as text.
+    """
+    from function_tool import MAX_PER_PAGE, calculate_job_statistics_async
     
-    elif name == "get_job_statistics":
-        keywords = arguments.get("keywords", "")
-        sample_size = arguments.get("sample_size", 20)
+    keywords = arguments.get("keywords", "")
+    
+    try:
+        sample_size = max(1, min(int(arguments.get("sample_size", 20)), MAX_PER_PAGE))
+    except (TypeError, ValueError):
+        return [TextContent(
+            type="text",
+            text="Error: 'sample_size' must be an integer"
+        )]
+    
+    if not keywords:
+        return [TextContent(
+            type="text",
+            text="Error: 'keywords' parameter is required"
+        )]
+    
+    result = await calculate_job_statistics_async(keywords, sample_size)
+    
+    if result.success:
+        stats = result.statistics
+        # Percentages divide by the sample size; guard against an empty sample
+        analyzed = result.jobs_analyzed or 1
         
-        if not keywords:
-            return [TextContent(
-                type="text",
-                text="Error: 'keywords' parameter is required"
-            )]
+        category_block = "\n".join(
+            f"  • {category}: {count} ({count / analyzed * 100:.1f}%)"
+            for category, count in stats['top_categories'].items()
+        )
+        employment_block = "\n".join(
+            f"  • {emp_type}: {count} ({count / analyzed * 100:.1f}%)"
+            for emp_type, count in stats['employment_types'].items()
+        )
+        location_block = "\n".join(
+            f"  • {location}: {count} jobs"
+            for location, count in stats['top_locations'].items()
+        )
+        education_block = "\n".join(
+            f"  • {edu}: {count} jobs"
+            for edu, count in stats['education_requirements'].items()
+        )
+        experience_block = "\n".join(
+            f"  • {exp}: {count} jobs"
+            for exp, count in stats['experience_requirements'].items()
+        )
         
-        result = calculate_job_statistics(keywords, sample_size)
+        sections = [
+            f"Job Market Statistics for '{keywords}'\n"
+            f"Total jobs in market: {result.total_jobs_in_market}\n"
+            f"Jobs analyzed: {result.jobs_analyzed}",
+            # An empty block adds no newline, so the header stands alone
+            "\n".join(filter(None, ("Top Categories:", category_block))),
+            "\n".join(filter(None, ("Employment Types:", employment_block))),
+            "\n".join(filter(None, ("Top Locations:", location_block))),
+        ]
+        if education_block:
+            sections.append(f"Education Requirements:\n{education_block}")
+        if experience_block:
+            sections.append(f"Experience Requirements:\n{experience_block}")
         
-        if result.get("success"):
-            stats = result['statistics']
-            response_text = f"Job Market Statistics for '{keywords}'\n"
-            response_text += f"Total jobs in market: {result['total_jobs_in_market']}\n"
-            response_text += f"Jobs analyzed: {result['jobs_analyzed']}\n\n"
-            
-            response_text += "Top Categories:\n"
-            for category, count in stats['top_categories'].items():
-                percentage = (count / result['jobs_analyzed'] * 100)
-                response_text += f"  • {category}: {count} ({percentage:.1f}%)\n"
-            
-            response_text += "\nEmployment Types:\n"
-            for emp_type, count in stats['employment_types'].items():
-                percentage = (count / result['jobs_analyzed'] * 100)
-                response_text += f"  • {emp_type}: {count} ({percentage:.1f}%)\n"
-            
-            response_text += "\nTop Locations:\n"
-            for location, count in stats['top_locations'].items():
-                response_text += f"  • {location}: {count} jobs\n"
-            
-            if stats['education_requirements']:
-                response_text += "\nEducation Requirements:\n"
-                for edu, count in stats['education_requirements'].items():
-                    response_text += f"  • {edu}: {count} jobs\n"
-            
-            if stats['experience_requirements']:
-                response_text += "\nExperience Requirements:\n"
-                for exp, count in stats['experience_requirements'].items():
-                    response_text += f"  • {exp}: {count} jobs\n"
-            
-            return [TextContent(type="text", text=response_text)]
-        else:
-            return [TextContent(
-                type="text",
-                text=f"Error: {result.get('error', 'Unknown error')}"
-            )]
+        return [TextContent(type="text", text="\n\n".join(sections))]
+    else:
+        return [TextContent(
+            type="text",
+            text=f"Error: {result.error or 'Unknown error'}"
+        )]
+
+
+async def _handle_job_details(arguments: Any) -> list[TextContent]:
+    """
+    Run the get_job_details tool.
+    """
+    job_id = arguments.get("job_id", "")
     
-    elif name == "get_job_details":
-        job_id = arguments.get("job_id", "")
-        
-        if not job_id:
-            return [TextContent(
-                type="text",
-                text="Error: 'job_id' parameter is required"
-            )]
-        
-        # Search for the specific job ID
-        # Note: The API doesn't have a direct job detail endpoint, 
-        # so we would need to search and filter
+    if not job_id:
         return [TextContent(
             type="text",
-            text=f"Job details for ID {job_id}: This would require additional API implementation. "
-                 f"Currently, use search_jobs and find the job in results."
+            text="Error: 'job_id' parameter is required"
         )]
     
-    else:
+    # Search for the specific job ID
+    # Note: The API doesn't have a direct job detail endpoint, 
+    # so we would need to search and filter
+    return [TextContent(
+        type="text",
+        text=f"Job details for ID {job_id}: This would require additional API implementation. "
+             f"Currently, use search_jobs and find the job in results."
+    )]
+
+
+# Tool name -> handler, looked up once per call instead of an if/elif chain
+_TOOL_HANDLERS = {
+    "search_jobs": _handle_search_jobs,
+    "get_job_statistics": _handle_job_statistics,
+    "get_job_details": _handle_job_details,
+}
+
+
+@app.call_tool()
+async def call_tool(name: str, arguments: Any) -> list[TextContent]:
+    """
+    Handle tool execution requests from MCP clients.
+    
+    Args:
+        name: Tool name to execute
+        arguments: Tool-specific arguments
+        
+    Returns:
+        List of TextContent with execution results
+    """
+    handler = _TOOL_HANDLERS.get(name)
+    if handler is None:
         return [TextContent(
             type="text",
             text=f"Error: Unknown tool '{name}'"
         )]
+    
+    return await handler(arguments)
 
 
 async def main():
@@ -239,12 +291,18 @@ async def main():
     Main entry point for the MCP server.
     Runs the server using stdio transport.
     """
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        # Release pooled HTTP connections if any tool call opened them
+        function_tool = sys.modules.get("function_tool")
+        if function_tool is not None:
+            function_tool.close_session()
 
 
 if __name__ == "__main__":
@@ -3,189 +3,559 @@ Function Tools for Job Search
 =============================
 This module provides utility functions for job search operations using the FindSGJobs API.
 
+Classes:
+- JobSearchResult: Result of a job search, with a converter for ADK tool responses
+- JobStatistics: Aggregated job market statistics, with the same converter
+
 Functions:
 - search_jobs_api: Search for jobs with detailed information
+- search_jobs_api_multi: Fetch several result pages concurrently
 - calculate_job_statistics: Get aggregated statistics about job market
+- search_jobs_api_async / calculate_job_statistics_async: Non-blocking variants for asyncio callers
+- pace: Async rate-limit helper based on the time of the last API request
+- close_session: Release the shared HTTP connection pool
 
 Author: ADK Demo
 Date: November 11, 2025
 """
 
+import asyncio
+import atexit
+import copy
+import math
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import orjson
 import requests
-from typing import Dict, Any
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, Iterator, List, Optional, Sequence
+import html
 import re
+import threading
+
+
+# Shared HTTP session so keep-alive connections to FindSGJobs are reused
+# across calls instead of paying a fresh TCP+TLS handshake every time.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        connect=2,
+        read=2,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    ),
+))
+
+# (connect, read) timeouts in seconds, so a hung connection fails fast
+_REQUEST_TIMEOUT = (3, 10)
+
+# Largest page size the API serves. Callers validate against this at their
+# boundary so the values reaching search_jobs_api (and its cache keys) are canonical.
+MAX_PER_PAGE = 20
+
+
+def close_session() -> None:
+    """
+    Close the shared HTTP session and release pooled connections.
+    """
+    _SESSION.close()
+
+
+atexit.register(close_session)
+
 
+# Monotonic timestamp of the most recent API request, used by pace()
+_last_request_at = 0.0
+
+
+# Precompiled patterns used when cleaning job descriptions. Descriptions only
+# need get_text()-style plain text, so tags are stripped by regex rather than
+# building a full HTML tree per job.
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACES_RE = re.compile(r'[^\S\n]+')
+_NEWLINES_RE = re.compile(r'\s*\n\s*')
+
+
+# ============================================================
+# Result Types
+# ============================================================
+
+@dataclass(slots=True)
+class JobSearchResult:
+    """
+    Structured result of a job search API call.
 
-def search_jobs_api(keywords: str, page: int = 1, per_page_count: int = 10) -> Dict[str, Any]:
+    Python callers (MCP server, statistics) read the attributes directly;
+    to_tool_response() builds the dict only at the ADK tool boundary.
+    """
+    success: bool
+    total_jobs: int = 0
+    current_page: int = 1
+    total_pages: int = 0
+    results_on_page: int = 0
+    jobs: List[Dict[str, Any]] = field(default_factory=list)
+    job_lines: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def to_tool_response(self) -> Dict[str, Any]:
+        """
+        Convert to the status-tagged dict returned by ADK function tools.
+
+        Returns:
+            dict: {"status": "success", ...} or {"status": "error", "error_message": ...}
+        """
+        if not self.success:
+            return {
+                "status": "error",
+                "error_message": self.error or "Unknown error"
+            }
+
+        return {
+            "status": "success",
+            "total_jobs": self.total_jobs,
+            "page": self.current_page,
+            "results_on_page": self.results_on_page,
+            "jobs": self.jobs
+        }
+
+
+@dataclass(slots=True)
+class JobStatistics:
+    """
+    Aggregated job market statistics for a keyword.
+    """
+    success: bool
+    keyword: str = ""
+    total_jobs_in_market: int = 0
+    jobs_analyzed: int = 0
+    statistics: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def to_tool_response(self) -> Dict[str, Any]:
+        """
+        Convert to the status-tagged dict returned by ADK function tools.
+
+        Returns:
+            dict: {"status": "success", "stats": {...}} or {"status": "error", "error_message": ...}
+        """
+        if not self.success:
+            return {
+                "status": "error",
+                "error_message": self.error or "Unknown error"
+            }
+
+        stats = self.statistics
+        return {
+            "status": "success",
+            "keyword": self.keyword,
+            "stats": {
+                "total_jobs_found": self.total_jobs_in_market,
+                "jobs_analyzed": self.jobs_analyzed,
+                "top_categories": stats.get("top_categories", {}),
+                "employment_types": stats.get("employment_types", {}),
+                "top_locations": stats.get("top_locations", {}),
+            }
+        }
+
+
+# In-process TTL + LRU caches for API results. Agents tend to repeat the same
+# keyword queries across turns and retries, so a short-lived cache saves a
+# full HTTPS round-trip plus HTML cleaning on every hit.
+_CACHE_TTL_SECONDS = 300
+_CACHE_MAXSIZE = 256
+_SEARCH_CACHE: Dict[tuple, tuple] = {}
+_STATS_CACHE: Dict[tuple, tuple] = {}
+
+# Most recent first-page listings per keyword, so statistics can reuse the
+# jobs a preceding search already fetched instead of hitting the API again
+_RECENT_JOBS_CACHE: Dict[tuple, tuple] = {}
+
+# Worker threads (asyncio.to_thread, the page-fetch pool) share the caches,
+# so every read-modify-write of a cache dict happens under this lock
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(cache: Dict[tuple, tuple], key: tuple) -> Optional[Any]:
+    """
+    Return a copy of a cached result, or None if missing or expired.
+    """
+    with _CACHE_LOCK:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+
+        stored_at, value = entry
+        if time.monotonic() - stored_at > _CACHE_TTL_SECONDS:
+            cache.pop(key, None)
+            return None
+
+        # Move the entry to the end so eviction drops the least recently used one
+        cache.pop(key, None)
+        cache[key] = entry
+
+    # Hand out a copy so callers can't mutate the cached result
+    return copy.deepcopy(value)
+
+
+def _cache_put(cache: Dict[tuple, tuple], key: tuple, value: Any) -> None:
+    """
+    Store a successful result in the cache, evicting the least recently used entry when full.
+    """
+    if not value.success:
+        return
+
+    entry = (time.monotonic(), copy.deepcopy(value))
+    with _CACHE_LOCK:
+        if key not in cache and len(cache) >= _CACHE_MAXSIZE:
+            cache.pop(next(iter(cache), None), None)
+        cache[key] = entry
+
+
+def search_jobs_api(
+    keywords: str,
+    page: int = 1,
+    per_page_count: int = 10,
+    format_text: bool = False,
+    *,
+    include_description: bool = False
+) -> JobSearchResult:
     """
     Search for jobs using the FindSGJobs API.
 
     Args:
         keywords: Search keywords (e.g., "cook", "engineer", "manager")
         page: Page number (default: 1)
-        per_page_count: Number of results per page (default: 10, max: 20)
+        per_page_count: Number of results per page (default: 10). Not clamped
+            here: callers must keep it within 1..MAX_PER_PAGE, as larger values
+            are sent to the API unchanged
+        format_text: Also fill job_lines with a display-ready text block per
+            job, built in the same pass that extracts the fields (default: False)
+        include_description: Clean and include each job's HTML description;
+            skipped by default since most callers never read it (default: False)
 
     Returns:
-        dict: Structured job search results with success status
+        JobSearchResult: Structured job search results with success status
+    """
+    cache_key = (keywords.lower().strip(), page, per_page_count, format_text, include_description)
+    cached = _cache_get(_SEARCH_CACHE, cache_key)
+    if cached is not None:
+        return cached
+
+    result = _fetch_jobs(keywords, page, per_page_count, format_text, include_description)
+    _cache_put(_SEARCH_CACHE, cache_key, result)
+    if page == 1:
+        _cache_put(_RECENT_JOBS_CACHE, cache_key[:1], result)
+    return result
+
+
+def _format_job_line(index: int, job_info: Dict[str, Any]) -> str:
+    """
+    Format one job as the text block shown in search results.
+    """
+    # Optional lines collapse to "" so the block is built by a single f-string
+    sal = f"   Salary: {job_info['salary']}\n" if job_info['salary'] else ""
+    loc = f"   Location: {', '.join(job_info['location'][:3])}\n" if job_info['location'] else ""
+    cat = f"   Categories: {', '.join(job_info['categories'])}\n" if job_info['categories'] else ""
+    return (
+        f"{index}. {job_info['title']}\n"
+        f"   Company: {job_info['company']}\n"
+        f"   Job ID: {job_info['job_id']}\n"
+        f"{sal}{loc}{cat}"
+        f"   URL: {job_info['url']}\n"
+    )
+
+
+def _fetch_jobs(
+    keywords: str,
+    page: int,
+    per_page_count: int,
+    format_text: bool,
+    include_description: bool
+) -> JobSearchResult:
+    """
+    Call the FindSGJobs search API and structure the response (uncached).
     """
     base_url = "https://www.findsgjobs.com/apis/job/search"
 
     params = {
         "page": page,
-        "per_page_count": min(per_page_count, 20),
+        "per_page_count": per_page_count,
         "keywords": keywords
     }
 
+    global _last_request_at
+
     try:
-        response = requests.get(base_url, params=params, timeout=10)
+        try:
+            response = _SESSION.get(base_url, params=params, timeout=_REQUEST_TIMEOUT)
+        finally:
+            _last_request_at = time.monotonic()
         response.raise_for_status()
-        json_response = response.json()
+        # orjson decodes straight from the body bytes, faster than the stdlib parser
+        json_response = orjson.loads(response.content)
 
-        # Extract and structure job data
+        # Extract and structure job data; missing sections fall back to defaults
         jobs = []
-        total_count = 0
-        current_page = page
-        total_pages = 0
-
-        if "data" in json_response:
-            data = json_response["data"]
-
-            # Get pagination info
-            if "pager" in data:
-                pager = data["pager"]
-                total_count = pager.get("record_count", 0)
-                current_page = pager.get("page", page)
-                total_pages = pager.get("page_count", 0)
-
-            # Extract job details
-            if "result" in data:
-                for item in data["result"]:
-                    job = item.get('job', {})
-                    company = item.get('company', {})
-
-                    # Extract salary information
-                    salary_info = None
-                    if not job.get('id_Job_Donotdisplaysalary', 0):
-                        salary_range = job.get('Salaryrange', {}).get('caption')
-                        if salary_range:
-                            currency = job.get('id_Job_Currency', {}).get('caption', 'SGD')
-                            interval = job.get('id_Job_Interval', {}).get('caption', 'Month')
-                            salary_info = f"{currency} {salary_range} per {interval}"
-
-                    # Extract description (clean HTML)
-                    description = job.get('JobDescription', '')
-                    if description:
-                        soup = BeautifulSoup(description, 'html.parser')
-                        plain_text = soup.get_text()
-                        plain_text = re.sub(r'\n+', '\n', plain_text).strip()
-                        description = plain_text[:500] + '...' if len(plain_text) > 500 else plain_text
-
-                    job_info = {
-                        "job_id": job.get('id', ''),
-                        "title": job.get('Title', 'N/A'),
-                        "company": company.get('CompanyName', 'N/A'),
-                        "url": f"https://www.findsgjobs.com/job/{job.get('id', '')}" if job.get('id') else '',
-                        "categories": [cat.get('caption', '') for cat in job.get('JobCategory', [])],
-                        "employment_type": [et.get('caption', '') for et in job.get('EmploymentType', [])],
-                        "location": [mrt.get('caption', '') for mrt in job.get('id_Job_NearestMRTStation', [])],
-                        "salary": salary_info,
-                        "experience": job.get('MinimumYearsofExperience', {}).get('caption', 'N/A'),
-                        "education": job.get('MinimumEducationLevel', {}).get('caption', 'N/A'),
-                        "position_level": job.get('id_Job_PositionLevel', {}).get('caption', 'N/A'),
-                        "work_arrangement": job.get('id_Job_WorkArrangement', {}).get('caption', 'N/A'),
-                        "skills": job.get('id_Job_Skills', []),
-                        "posted_date": job.get('activation_date', 'N/A'),
-                        "expires_date": job.get('expiration_date', 'N/A'),
-                        "description": description
-                    }
-
-                    jobs.append(job_info)
-
-        return {
-            "success": True,
-            "total_jobs": total_count,
-            "current_page": current_page,
-            "total_pages": total_pages,
-            "results_on_page": len(jobs),
-            "jobs": jobs
-        }
+        job_lines = []
+
+        data = json_response.get("data") or {}
+
+        # Get pagination info
+        pager = data.get("pager") or {}
+        total_count = pager.get("record_count", 0)
+        current_page = pager.get("page", page)
+        total_pages = pager.get("page_count", 0)
+
+        # Extract job details
+        results = data.get("result") or []
+        for item in results:
+            job = item.get('job', {})
+            company = item.get('company', {})
+
+            # Bind the lookup method and the job ID once per job
+            jg = job.get
+            jid = jg('id', '')
+
+            # Extract salary information
+            salary_info = None
+            if not jg('id_Job_Donotdisplaysalary', 0):
+                salary_range = (jg('Salaryrange') or {}).get('caption')
+                if salary_range:
+                    currency = (jg('id_Job_Currency') or {}).get('caption', 'SGD')
+                    interval = (jg('id_Job_Interval') or {}).get('caption', 'Month')
+                    salary_info = f"{currency} {salary_range} per {interval}"
+
+            # Extract description (clean HTML) only when requested
+            description = jg('JobDescription', '') if include_description else ''
+            if description:
+                plain_text = html.unescape(_TAG_RE.sub(' ', description))
+                plain_text = _SPACES_RE.sub(' ', plain_text)
+                plain_text = _NEWLINES_RE.sub('\n', plain_text).strip()
+                if len(plain_text) > 500:
+                    # Cut at the last word boundary near the limit rather than mid-word
+                    cut = plain_text.rfind(' ', 400, 500)
+                    cut = 500 if cut == -1 else cut
+                    description = f"{plain_text[:cut]}…"
+                else:
+                    description = plain_text
+
+            job_info = {
+                "job_id": jid,
+                "title": jg('Title', 'N/A'),
+                "company": company.get('CompanyName', 'N/A'),
+                "url": f"https://www.findsgjobs.com/job/{jid}" if jid else '',
+                "categories": [c for c in (cat.get('caption') for cat in jg('JobCategory', [])) if c],
+                "employment_type": [e for e in (et.get('caption') for et in jg('EmploymentType', [])) if e],
+                "location": [m for m in (mrt.get('caption') for mrt in jg('id_Job_NearestMRTStation', [])) if m],
+                "salary": salary_info,
+                "experience": (jg('MinimumYearsofExperience') or {}).get('caption', 'N/A'),
+                "education": (jg('MinimumEducationLevel') or {}).get('caption', 'N/A'),
+                "position_level": (jg('id_Job_PositionLevel') or {}).get('caption', 'N/A'),
+                "work_arrangement": (jg('id_Job_WorkArrangement') or {}).get('caption', 'N/A'),
+                "skills": jg('id_Job_Skills', []),
+                "posted_date": jg('activation_date', 'N/A'),
+                "expires_date": jg('expiration_date', 'N/A'),
+                "description": description
+            }
+
+            jobs.append(job_info)
+            if format_text:
+                job_lines.append(_format_job_line(len(jobs), job_info))
+
+        return JobSearchResult(
+            success=True,
+            total_jobs=total_count,
+            current_page=current_page,
+            total_pages=total_pages,
+            results_on_page=len(jobs),
+            jobs=jobs,
+            job_lines=job_lines
+        )
 
     except requests.exceptions.RequestException as e:
-        return {
-            "success": False,
-            "error": f"API request failed: {str(e)}"
-        }
+        return JobSearchResult(success=False, error=f"API request failed: {str(e)}")
     except Exception as e:
-        return {
-            "success": False,
-            "error": f"Unexpected error: {str(e)}"
-        }
+        return JobSearchResult(success=False, error=f"Unexpected error: {str(e)}")
 
 
-def calculate_job_statistics(keywords: str, sample_size: int = 20) -> Dict[str, Any]:
+def search_jobs_api_multi(
+    keywords: str,
+    pages: Sequence[int],
+    per_page_count: int = 10
+) -> List[JobSearchResult]:
+    """
+    Fetch several pages of search results concurrently.
+
+    Each page goes through search_jobs_api (and its cache) on a worker thread;
+    the shared session's connection pool lets the requests overlap.
+
+    Args:
+        keywords: Search keywords
+        pages: Page numbers to fetch
+        per_page_count: Number of results per page (default: 10). Not clamped
+            here: callers must keep it within 1..MAX_PER_PAGE, as larger values
+            are sent to the API unchanged
+
+    Returns:
+        list: One JobSearchResult per requested page, in the same order
+    """
+    if len(pages) <= 1:
+        return [search_jobs_api(keywords, page=p, per_page_count=per_page_count) for p in pages]
+
+    with ThreadPoolExecutor(max_workers=min(8, len(pages))) as executor:
+        return list(executor.map(
+            lambda p: search_jobs_api(keywords, page=p, per_page_count=per_page_count),
+            pages
+        ))
+
+
+def calculate_job_statistics(keywords: str, sample_size: int = 20) -> JobStatistics:
     """
     Get statistical summary of job search results.
 
     Args:
         keywords: Search keywords
-        sample_size: Number of jobs to analyze (max 20)
+        sample_size: Number of jobs to analyze (fetched 20 per page; pages
+            are requested concurrently when more than one is needed)
 
     Returns:
-        dict: Job market statistics with success status
+        JobStatistics: Job market statistics with success status
     """
-    # Get job listings
-    result = search_jobs_api(keywords, page=1, per_page_count=min(sample_size, 20))
+    # Normalise once so the cache key, page planning and sample slice agree;
+    # a negative size would otherwise slice jobs from the end of a page
+    sample_size = max(0, sample_size)
 
-    if not result.get("success"):
-        return result
+    cache_key = (keywords.lower().strip(), sample_size)
+    cached = _cache_get(_STATS_CACHE, cache_key)
+    if cached is not None:
+        return cached
 
-    jobs = result.get("jobs", [])
-    total_jobs = result.get("total_jobs", 0)
+    result = _compute_job_statistics(keywords, sample_size)
+    _cache_put(_STATS_CACHE, cache_key, result)
+    return result
+
+
+def _iter_sample_pages(keywords: str, sample_size: int) -> Iterator[JobSearchResult]:
+    """
+    Yield pages of job listings covering the sample.
+
+    Reuses the listings from a recent search for the same keywords when they
+    already cover the sample; otherwise fetches the needed pages concurrently.
+    """
+    recent = _cache_get(_RECENT_JOBS_CACHE, (keywords.lower().strip(),))
+    if recent is not None and len(recent.jobs) >= min(sample_size, recent.total_jobs):
+        yield recent
+        return
 
+    # Plan the page fetches needed to cover the sample
+    per_page = max(1, min(sample_size, MAX_PER_PAGE))
+    pages = range(1, math.ceil(max(sample_size, 1) / per_page) + 1)
+
+    yield from search_jobs_api_multi(keywords, pages, per_page)
+
+
+def _compute_job_statistics(keywords: str, sample_size: int) -> JobStatistics:
+    """
+    Fetch job listings and aggregate them into market statistics (uncached).
+    """
     # Compute statistics
-    category_counts = {}
-    employment_type_counts = {}
-    location_counts = {}
-    education_counts = {}
-    experience_counts = {}
-
-    for job in jobs:
-        # Count categories
-        for category in job.get("categories", []):
-            if category:
-                category_counts[category] = category_counts.get(category, 0) + 1
-
-        # Count employment types
-        for emp_type in job.get("employment_type", []):
-            if emp_type:
-                employment_type_counts[emp_type] = employment_type_counts.get(emp_type, 0) + 1
-
-        # Count locations
-        for location in job.get("location", []):
-            if location:
-                location_counts[location] = location_counts.get(location, 0) + 1
-
-        # Count education levels
-        education = job.get("education")
-        if education and education != "N/A":
-            education_counts[education] = education_counts.get(education, 0) + 1
-
-        # Count experience levels
-        experience = job.get("experience")
-        if experience and experience != "N/A":
-            experience_counts[experience] = experience_counts.get(experience, 0) + 1
-
-    return {
-        "success": True,
-        "keyword": keywords,
-        "total_jobs_in_market": total_jobs,
-        "jobs_analyzed": len(jobs),
-        "statistics": {
-            "top_categories": dict(sorted(category_counts.items(), key=lambda x: x[1], reverse=True)[:5]),
-            "employment_types": employment_type_counts,
-            "top_locations": dict(sorted(location_counts.items(), key=lambda x: x[1], reverse=True)[:5]),
-            "education_requirements": education_counts,
-            "experience_requirements": experience_counts
+    category_counts = Counter()
+    employment_type_counts = Counter()
+    location_counts = Counter()
+    education_counts = Counter()
+    experience_counts = Counter()
+    total_jobs = 0
+    jobs_analyzed = 0
+
+    # Count each page's jobs in turn, stopping once the sample is covered
+    for result in _iter_sample_pages(keywords, sample_size):
+        if not result.success:
+            return JobStatistics(success=False, keyword=keywords, error=result.error)
+
+        total_jobs = total_jobs or result.total_jobs
+
+        for job in result.jobs[:sample_size - jobs_analyzed]:
+            jobs_analyzed += 1
+
+            # Count categories, employment types and locations (Counter.update runs in C;
+            # empty captions are already dropped when the jobs are built)
+            category_counts.update(job["categories"])
+            employment_type_counts.update(job["employment_type"])
+            location_counts.update(job["location"])
+
+            # Count education levels
+            education = job.get("education")
+            if education and education != "N/A":
+                education_counts[education] += 1
+
+            # Count experience levels
+            experience = job.get("experience")
+            if experience and experience != "N/A":
+                experience_counts[experience] += 1
+
+    return JobStatistics(
+        success=True,
+        keyword=keywords,
+        total_jobs_in_market=total_jobs,
+        jobs_analyzed=jobs_analyzed,
+        statistics={
+            "top_categories": dict(category_counts.most_common(5)),
+            "employment_types": dict(employment_type_counts),
+            "top_locations": dict(location_counts.most_common(5)),
+            "education_requirements": dict(education_counts),
+            "experience_requirements": dict(experience_counts)
         }
-    }
\ No newline at end of file
+    )
+
+
+# ============================================================
+# Async Variants
+# ============================================================
+
+async def search_jobs_api_async(
+    keywords: str,
+    page: int = 1,
+    per_page_count: int = 10,
+    format_text: bool = False,
+    *,
+    include_description: bool = False
+) -> JobSearchResult:
+    """
+    Non-blocking version of search_jobs_api for asyncio callers (e.g. the MCP server).
+
+    The request runs in a worker thread on the shared session, so concurrent
+    tool calls overlap on the network instead of blocking the event loop.
+    """
+    return await asyncio.to_thread(
+        search_jobs_api, keywords, page, per_page_count, format_text,
+        include_description=include_description
+    )
+
+
+async def calculate_job_statistics_async(keywords: str, sample_size: int = 20) -> JobStatistics:
+    """
+    Non-blocking version of calculate_job_statistics for asyncio callers.
+    """
+    return await asyncio.to_thread(calculate_job_statistics, keywords, sample_size)
+
+
+async def pace(min_gap: float) -> None:
+    """
+    Wait until at least min_gap seconds have passed since the last API request.
+
+    Unlike a fixed sleep, time already spent on other work counts towards the
+    gap, and the event loop stays free while waiting.
+
+    Args:
+        min_gap: Minimum spacing in seconds to respect the API rate limit
+    """
+    delay = _last_request_at + min_gap - time.monotonic()
+    if delay > 0:
+        await asyncio.sleep(delay)